@@ -1,10 +1,27 @@
+import asyncio
 import bcrypt
+import concurrent.futures
 import jwt
 import datetime
+import os
+import time
+from collections import OrderedDict
 from functools import wraps
-from flask import request, jsonify
+from quart import request, jsonify
+from bson import ObjectId
 import requests
 import config
+from cachetools import TTLCache
+from http_client import http_session
+
+# Userinfo for a given Google access token is stable while the token lives;
+# a short TTL keeps repeat logins with the same token off the Google round
+# trip. Failures are not cached.
+_GOOGLE_ID_CACHE = TTLCache(maxsize=100000, ttl=300)
+
+# Bcrypt is ~100ms of pure CPU per call and would otherwise stall the event
+# loop; run it in a process pool so hashes scale across cores.
+BCRYPT_POOL = concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count())
 
 
 def hash_password(password: str) -> str:
@@ -19,6 +36,20 @@ def verify_password(password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
 
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the bcrypt process pool without blocking the loop"""
+    return await asyncio.get_running_loop().run_in_executor(
+        BCRYPT_POOL, hash_password, password
+    )
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    """Verify a password on the bcrypt process pool without blocking the loop"""
+    return await asyncio.get_running_loop().run_in_executor(
+        BCRYPT_POOL, verify_password, password, hashed_password
+    )
+
+
 def generate_token(user_id: str, email: str) -> str:
     """Generate a JWT token with 24-hour expiry"""
     payload = {
@@ -31,21 +62,49 @@ def generate_token(user_id: str, email: str) -> str:
     return token
 
 
+# Verified-token cache: every authenticated request otherwise re-runs the
+# HMAC decode. Entries live until the token's own expiry; the app has no
+# token revocation, so caching does not change auth semantics.
+_TOKEN_CACHE_MAX = 50000
+_token_cache = OrderedDict()  # token -> (payload, exp)
+
+
 def verify_token(token: str) -> dict:
-    """Verify and decode a JWT token"""
+    """Verify and decode a JWT token (memoized until token expiry)"""
+    now = time.time()
+
+    cached = _token_cache.get(token)
+    if cached is not None:
+        payload, exp = cached
+        if exp > now:
+            return payload
+        _token_cache.pop(token, None)
+        return None
+
     try:
         payload = jwt.decode(token, config.JWT_SECRET_KEY, algorithms=['HS256'])
-        return payload
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
 
+    # Pre-build the BSON ObjectId once per token so routes don't re-run
+    # its validation on every request
+    try:
+        payload['user_oid'] = ObjectId(payload['user_id'])
+    except Exception:
+        return None
+
+    _token_cache[token] = (payload, payload.get('exp', now))
+    if len(_token_cache) > _TOKEN_CACHE_MAX:
+        _token_cache.popitem(last=False)
+    return payload
+
 
 def token_required(f):
     """Decorator for protected routes"""
     @wraps(f)
-    def decorated(*args, **kwargs):
+    async def decorated(*args, **kwargs):
         token = None
         
         # Get token from Authorization header
@@ -63,21 +122,29 @@ def token_required(f):
         
         # Add user info to request context
         request.user_id = payload['user_id']
+        request.user_oid = payload['user_oid']
         request.user_email = payload['email']
         
-        return f(*args, **kwargs)
-    
+        return await f(*args, **kwargs)
+
     return decorated
 
 
 def verify_google_token(token: str):
-    """Verify Google Access Token and get user info"""
+    """Verify Google Access Token and get user info (cached for 5 minutes)"""
+    cached = _GOOGLE_ID_CACHE.get(token)
+    if cached is not None:
+        return cached
+
     try:
-        response = requests.get(
-            f"https://www.googleapis.com/oauth2/v1/userinfo?alt=json&access_token={token}"
+        response = http_session.get(
+            f"https://www.googleapis.com/oauth2/v1/userinfo?alt=json&access_token={token}",
+            timeout=(3, 10),
         )
         if response.status_code == 200:
-            return response.json()
+            id_info = response.json()
+            _GOOGLE_ID_CACHE[token] = id_info
+            return id_info
         return None
     except Exception as e:
         print(f"Token verification failed: {e}")
@@ -1,4 +1,5 @@
 import cloudinary
+import cloudinary.api
 import cloudinary.uploader
 import config
 
@@ -23,11 +24,13 @@ def upload_image(file, folder="qwenify/images"):
     }
 
 def upload_video(file, folder="qwenify/videos"):
-    """Upload video to Cloudinary (max 100MB)"""
-    result = cloudinary.uploader.upload(
+    """Upload video to Cloudinary in 6MB chunks (max 100MB)"""
+    # upload_large streams the file instead of buffering it fully in memory
+    result = cloudinary.uploader.upload_large(
         file,
         folder=folder,
-        resource_type="video"
+        resource_type="video",
+        chunk_size=6 * 1024 * 1024
     )
     return {
         "url": result["secure_url"],
@@ -50,3 +53,18 @@ def upload_file(file, folder="qwenify/vault"):
 def delete_media(public_id, resource_type="image"):
     """Delete media from Cloudinary"""
     return cloudinary.uploader.destroy(public_id, resource_type=resource_type)
+
+def delete_media_batch(public_ids, resource_type="image"):
+    """Delete media items from Cloudinary, batched 100 per API call.
+
+    Cloudinary's Admin API rejects delete_resources calls with more than
+    100 public IDs, so larger lists are split transparently.
+    """
+    results = []
+    for i in range(0, len(public_ids), 100):
+        results.append(
+            cloudinary.api.delete_resources(
+                public_ids[i:i + 100], resource_type=resource_type
+            )
+        )
+    return results
@@ -30,6 +30,9 @@ UPLOADS_DIR = os.path.join(BASE_DIR, "uploads")
 # MongoDB
 MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
 
+# Redis (optional, shares the semantic chat cache between workers)
+REDIS_URL = os.getenv("REDIS_URL")
+
 # Cloudinary
 CLOUDINARY_CLOUD_NAME = os.getenv("CLOUDINARY_CLOUD_NAME")
 CLOUDINARY_API_KEY = os.getenv("CLOUDINARY_API_KEY")
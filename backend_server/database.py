@@ -1,4 +1,9 @@
+import hashlib
+from collections import OrderedDict
+
 import chromadb
+import numpy as np
+
 import config
 
 # Initialize Client
@@ -14,3 +19,25 @@ except Exception as e:
     # Fallback or null object if needed, but for now we let it fail or log
     # In production, we might want a mock collection if RAG is optional
     raise e
+
+
+# Memoized query embeddings: repeat queries skip the sentence-transformer
+# encode entirely (the dominant non-LLM cost of /chat). Keyed by SHA-256 of
+# the text, stored as float32 to keep the cache small, evicted LRU.
+_EMBED_CACHE_MAX = 4096
+_embed_cache = OrderedDict()
+
+
+def embed_cached(text: str) -> np.ndarray:
+    """Embed text with the collection's embedding function, memoized."""
+    key = hashlib.sha256(text.encode()).digest()
+    cached = _embed_cache.get(key)
+    if cached is not None:
+        _embed_cache.move_to_end(key)
+        return cached
+
+    embedding = np.asarray(collection._embedding_function([text])[0], dtype=np.float32)
+    _embed_cache[key] = embedding
+    if len(_embed_cache) > _EMBED_CACHE_MAX:
+        _embed_cache.popitem(last=False)
+    return embedding
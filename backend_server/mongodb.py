@@ -1,9 +1,23 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, WriteConcern
+import gridfs
 import config
 
 # Initialize MongoDB Client
 print(f"Connecting to MongoDB...")
-mongo_client = MongoClient(config.MONGODB_URI)
+mongo_client = MongoClient(
+    config.MONGODB_URI,
+    # Defer connection setup to first use so import doesn't block on DNS
+    # and the pool is created after any worker fork
+    connect=False,
+    maxPoolSize=200,
+    minPoolSize=10,
+    maxIdleTimeMS=60000,
+    retryWrites=True,
+    serverSelectionTimeoutMS=3000,
+    # Wire compression cuts the large canvas/writing payload bytes;
+    # falls back silently if the zstd library is unavailable.
+    compressors="zstd,snappy",
+)
 
 # Get database and collections
 db = mongo_client["qwenify"]
@@ -12,22 +26,50 @@ users_collection = db["users"]
 chats_collection = db["chats"]
 channel_stats_collection = db["channel_stats"]
 tasks_collection = db["tasks"]
+chat_messages_collection = db["chat_messages"]
 vault_collection = db["vault"]
 calendar_events_collection = db["calendar_events"]
 
-try:
-    print("Setting up MongoDB indices...")
-    # Create unique index on email for users
-    users_collection.create_index("email", unique=True)
-
-    # Create index for channel stats queries
-    channel_stats_collection.create_index([("userId", 1), ("recordedAt", -1)])
-    
-    # Create index for calendar events queries
-    calendar_events_collection.create_index([("userId", 1), ("start", 1)])
-    print("MongoDB indices set up successfully.")
-except Exception as e:
-    print(f"Warning: Failed to set up MongoDB indices: {e}")
-    print("Application will continue to start, but performance may be impacted.")
-
-print("MongoDB initialization complete.")
+# Canvas blobs live out-of-band in GridFS so the project document stays
+# small; workspace.canvasId points at the current file.
+canvas_fs = gridfs.GridFS(db, collection="canvas")
+
+# Relaxed write concern (w=1, no journal wait) for high-frequency,
+# low-criticality workspace writes like canvas/writing autosaves and
+# chat-history pushes. Losing one autosave on a crash is acceptable.
+projects_fast_writes = projects_collection.with_options(
+    write_concern=WriteConcern(w=1, j=False)
+)
+
+def ensure_indexes():
+    """Create the indexes the query paths rely on.
+
+    Called from the app's before_serving hook rather than at import time so
+    connect=False actually defers the first connection past import/fork.
+    """
+    try:
+        print("Setting up MongoDB indices...")
+        # Create unique index on email for users
+        users_collection.create_index("email", unique=True)
+
+        # Sparse index for channel lookups (only users with a linked channel)
+        users_collection.create_index("youtubeChannelId", sparse=True)
+
+        # Create index for channel stats queries
+        channel_stats_collection.create_index([("userId", 1), ("recordedAt", -1)])
+
+        # Create index for calendar events queries
+        calendar_events_collection.create_index([("userId", 1), ("start", 1)])
+
+        # Create index for full project chat history (overflow of the capped
+        # workspace.chatHistory array)
+        chat_messages_collection.create_index([("projectId", 1), ("timestamp", 1)])
+
+        # Create compound indexes for the per-user list views so the sort
+        # walks the index instead of sorting in memory
+        projects_collection.create_index([("userId", 1), ("created", -1)], background=True)
+        chats_collection.create_index([("userId", 1), ("updatedAt", -1)], background=True)
+        print("MongoDB indices set up successfully.")
+    except Exception as e:
+        print(f"Warning: Failed to set up MongoDB indices: {e}")
+        print("Application will continue to start, but performance may be impacted.")
@@ -1,9 +1,9 @@
 import time
 import datetime
 import feedparser
-import requests
 import config
 from database import collection
+from http_client import http_session
 
 def clear_existing_news():
     """Wipes old news to prevent stale data conflicts."""
@@ -21,16 +21,13 @@ def fetch_and_store_news():
     # Simple date string for today (since RSS pubDate parsing can be messy)
     today_str = datetime.datetime.now().strftime("%Y-%m-%d")
 
-    # Get top 5
+    # Get top 5, embedded and stored as one batched upsert
+    ids, docs, metas = [], [], []
+    batch_ts = int(time.time())
     for idx, entry in enumerate(feed.entries[:5]):
-        text = f"[Published: {today_str}] Title: {entry.title}. Summary: {entry.summary}"
-        # Store
-        unique_id = f"news_{int(time.time())}_{idx}"
-        collection.upsert(
-            ids=[unique_id], 
-            documents=[text],
-            metadatas=[{"type": "news", "title": entry.title, "date": today_str}]
-        )
+        ids.append(f"news_{batch_ts}_{idx}")
+        docs.append(f"[Published: {today_str}] Title: {entry.title}. Summary: {entry.summary}")
+        metas.append({"type": "news", "title": entry.title, "date": today_str})
         news_data.append({
             "title": entry.title,
             "description": entry.summary,
@@ -39,6 +36,9 @@ def fetch_and_store_news():
             "publishedAt": today_str
         })
 
+    if ids:
+        collection.upsert(ids=ids, documents=docs, metadatas=metas)
+
     return news_data
 
 
@@ -59,7 +59,7 @@ def fetch_trends(category=None, query=None):
         url = f"https://newsapi.org/v2/top-headlines?country=us&category=general&apiKey={config.NEWS_API_KEY}"
 
     try:
-        resp = requests.get(url).json()
+        resp = http_session.get(url, timeout=10).json()
         if resp.get("status") == "ok":
             for article in resp["articles"]:
                 all_articles.append({
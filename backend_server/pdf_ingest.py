@@ -1,51 +1,63 @@
 import os
 import datetime
-import time
+from concurrent.futures import ProcessPoolExecutor
 from pypdf import PdfReader
 import config
 from database import collection
 
+def _extract_pdf(file_path):
+    """Extract one PDF into (ids, docs, metas, filename) for upserting.
+
+    Top-level so it is picklable: extraction is CPU-bound and runs in
+    worker processes, while the Chroma upsert stays in the main process.
+    """
+    today_str = datetime.datetime.now().strftime("%Y-%m-%d")
+    rel_path = os.path.relpath(file_path, config.UPLOADS_DIR)
+    ids, docs, metas = [], [], []
+    try:
+        reader = PdfReader(file_path)
+        for i, page in enumerate(reader.pages):
+            # Plain extraction skips pypdf's layout
+            # reconstruction, which dominates per-page cost
+            text = (page.extract_text(extraction_mode="plain") or "").strip()
+            if len(text) < 40:
+                # Too little text to be worth an embedding
+                continue
+            # Contextual ID: filename_page
+            ids.append(f"pdf_{rel_path}_p{i}")
+            docs.append(f"[Ingested: {today_str}] SOURCE: PDF Document ({rel_path}, Page {i+1}) CONTENT: {text}")
+            metas.append({"type": "pdf", "source": rel_path, "page": i+1, "date": today_str})
+    except Exception as e:
+        print(f"Error processing {os.path.basename(file_path)}: {e}")
+        return [], [], [], None
+    return ids, docs, metas, os.path.basename(file_path)
+
 def ingest_local_pdfs():
     print(f"Scanning '{config.UPLOADS_DIR}' for PDFs...")
     processed_files = []
-    
+
     if not os.path.exists(config.UPLOADS_DIR):
         os.makedirs(config.UPLOADS_DIR)
         return []
-        
-    today_str = datetime.datetime.now().strftime("%Y-%m-%d")
 
-    for root, dirs, files in os.walk(config.UPLOADS_DIR):
-        for file in files:
-            if file.lower().endswith(".pdf"):
-                file_path = os.path.join(root, file)
-                try:
-                    reader = PdfReader(file_path)
-                    print(f"Processing: {file}")
-                    
-                    for i, page in enumerate(reader.pages):
-                        # Yield control to prevent OOM / high CPU locks
-                        time.sleep(0.1) 
-                        
-                        text = page.extract_text()
-                        if text:
-                            # Contextual ID: filename_page
-                            rel_path = os.path.relpath(file_path, config.UPLOADS_DIR)
-                            unique_id = f"pdf_{rel_path}_p{i}"
-                            
-                            document_text = f"""
-                            [Ingested: {today_str}]
-                            SOURCE: PDF Document ({rel_path}, Page {i+1})
-                            CONTENT: {text}
-                            """
-                            
-                            collection.upsert(
-                                ids=[unique_id],
-                                documents=[document_text],
-                                metadatas=[{"type": "pdf", "source": rel_path, "page": i+1, "date": today_str}]
-                            )
-                    processed_files.append(file)
-                except Exception as e:
-                    print(f"Error processing {file}: {e}")
-                    
+    paths = [
+        os.path.join(root, file)
+        for root, dirs, files in os.walk(config.UPLOADS_DIR)
+        for file in files
+        if file.lower().endswith(".pdf")
+    ]
+    if not paths:
+        return []
+
+    # Extraction parallelizes across cores; each file still gets one
+    # batched upsert so the embedder amortizes its inference
+    with ProcessPoolExecutor() as executor:
+        for ids, docs, metas, filename in executor.map(_extract_pdf, paths):
+            if filename is None:
+                continue
+            print(f"Processing: {filename}")
+            if ids:
+                collection.upsert(ids=ids, documents=docs, metadatas=metas)
+            processed_files.append(filename)
+
     return processed_files
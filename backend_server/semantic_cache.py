@@ -0,0 +1,162 @@
+import json
+import time
+
+import numpy as np
+
+import config
+
+# Number of random hyperplanes used for LSH bucketing. 64 signs pack into
+# an 8-byte bucket key via np.packbits.
+NUM_HYPERPLANES = 64
+EMBEDDING_DIM = 384  # all-MiniLM-L6-v2 (Chroma default embedding function)
+
+# Fixed seed so every worker process hashes embeddings into the same buckets
+# (required for sharing buckets through Redis). float32 keeps the projection
+# and similarity math in single-precision BLAS.
+_rng = np.random.default_rng(42)
+_HYPERPLANES = _rng.standard_normal((NUM_HYPERPLANES, EMBEDDING_DIM)).astype(
+    np.float32
+)
+
+# Cache entries older than this are ignored and pruned.
+DEFAULT_TTL_SECONDS = 3600
+
+# Minimum cosine similarity between query embeddings to count as a hit.
+SIMILARITY_THRESHOLD = 0.95
+
+
+def _bucket_key(embedding: np.ndarray) -> bytes:
+    """Project the embedding onto the hyperplanes and pack the sign bits."""
+    return np.packbits(_HYPERPLANES @ embedding > 0).tobytes()
+
+
+def _normalize(embedding) -> np.ndarray:
+    """L2-normalize to float32 so cosine similarity reduces to a dot product."""
+    vec = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    if norm > 0:
+        vec = vec / norm
+    return vec
+
+
+class _Bucket:
+    """One LSH bucket: a contiguous (n, d) matrix of normalized embeddings
+    plus parallel response metadata, so a probe is a single BLAS GEMV."""
+
+    def __init__(self):
+        self.matrix = np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+        self.responses = []  # [{"answer", "thought", "expires_at"}, ...]
+
+    def add(self, unit_embedding, response):
+        self.matrix = np.vstack([self.matrix, unit_embedding[np.newaxis, :]])
+        self.responses.append(response)
+
+    def prune(self, now):
+        alive = np.fromiter(
+            (r["expires_at"] > now for r in self.responses),
+            dtype=bool,
+            count=len(self.responses),
+        )
+        if not alive.all():
+            self.matrix = self.matrix[alive]
+            self.responses = [r for r, keep in zip(self.responses, alive) if keep]
+
+    def best_match(self, unit_query):
+        if not self.responses:
+            return None
+        scores = self.matrix @ unit_query  # single sgemv over the bucket
+        best = int(np.argmax(scores))
+        if scores[best] >= SIMILARITY_THRESHOLD:
+            return self.responses[best]
+        return None
+
+
+class SemanticCache:
+    """
+    LSH-bucketed semantic cache for full chat responses.
+
+    Buckets live in-process and are mirrored to Redis when REDIS_URL is
+    configured so multiple workers share hits.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL_SECONDS):
+        self.ttl = ttl
+        self._buckets = {}
+        self._redis = None
+
+        if config.REDIS_URL:
+            try:
+                import redis
+
+                self._redis = redis.Redis.from_url(
+                    config.REDIS_URL, decode_responses=True
+                )
+                self._redis.ping()
+                print("SemanticCache: Redis backend connected.")
+            except Exception as e:
+                print(f"Warning: SemanticCache Redis unavailable, in-process only: {e}")
+                self._redis = None
+
+    def get(self, embedding):
+        """Return {'answer': ..., 'thought': ...} for a near-duplicate query, or None."""
+        unit = _normalize(embedding)
+        bucket = self._load_bucket(_bucket_key(unit))
+        if bucket is None:
+            return None
+
+        bucket.prune(time.time())
+        match = bucket.best_match(unit)
+        if match:
+            return {"answer": match["answer"], "thought": match["thought"]}
+        return None
+
+    def set(self, embedding, answer, thought=""):
+        """Store a full response under the embedding's LSH bucket."""
+        unit = _normalize(embedding)
+        key = _bucket_key(unit)
+        response = {
+            "answer": answer,
+            "thought": thought,
+            "expires_at": time.time() + self.ttl,
+        }
+        self._buckets.setdefault(key, _Bucket()).add(unit, response)
+
+        if self._redis:
+            try:
+                redis_key = f"semcache:{key.hex()}"
+                entry = dict(response, embedding=unit.tolist())
+                self._redis.rpush(redis_key, json.dumps(entry))
+                self._redis.expire(redis_key, self.ttl)
+            except Exception as e:
+                print(f"Warning: SemanticCache Redis write failed: {e}")
+
+    def clear(self):
+        """Invalidate everything (called when the news DB is refreshed)."""
+        self._buckets = {}
+        if self._redis:
+            try:
+                for key in self._redis.scan_iter("semcache:*"):
+                    self._redis.delete(key)
+            except Exception as e:
+                print(f"Warning: SemanticCache Redis clear failed: {e}")
+
+    def _load_bucket(self, key):
+        bucket = self._buckets.get(key)
+        if bucket is None and self._redis:
+            try:
+                raw = self._redis.lrange(f"semcache:{key.hex()}", 0, -1)
+                if raw:
+                    bucket = _Bucket()
+                    for item in raw:
+                        entry = json.loads(item)
+                        bucket.add(
+                            np.asarray(entry.pop("embedding"), dtype=np.float32),
+                            entry,
+                        )
+                    self._buckets[key] = bucket
+            except Exception as e:
+                print(f"Warning: SemanticCache Redis read failed: {e}")
+        return bucket
+
+
+chat_cache = SemanticCache()
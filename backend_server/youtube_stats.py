@@ -9,6 +9,7 @@ import base64
 import datetime
 import json
 import requests
+from cachetools import TTLCache
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import matplotlib
@@ -19,6 +20,7 @@ import matplotlib.dates as mdates
 import numpy as np
 
 import config
+from http_client import http_session
 from mongodb import users_collection, channel_stats_collection
 
 
@@ -66,6 +68,48 @@ def get_channel_stats(channel_id: str) -> dict:
         return None
 
 
+# The dashboard polls realtime/growth/graph endpoints aggressively; a short
+# per-channel TTL cache keeps repeat polls off the YouTube Data API (saves
+# both the HTTPS round trip and API quota).
+_STATS_CACHE = TTLCache(maxsize=10000, ttl=60)
+
+
+def cached_get_channel_stats(channel_id: str) -> dict:
+    """get_channel_stats with a 60-second per-channel TTL cache"""
+    stats = _STATS_CACHE.get(channel_id)
+    if stats is None:
+        stats = get_channel_stats(channel_id)
+        if stats:
+            _STATS_CACHE[channel_id] = stats
+    return stats
+
+
+# Analytics reports are deterministic per (channel, start, end) once the
+# range lies entirely in the past, so those cache for a week; ranges that
+# include today get a short TTL instead.
+_ANALYTICS_HISTORY_CACHE = TTLCache(maxsize=10000, ttl=7 * 86400)
+_ANALYTICS_RECENT_CACHE = TTLCache(maxsize=10000, ttl=300)
+
+
+def cached_fetch_youtube_analytics_range(
+    channel_id: str, access_token: str, start_date: str, end_date: str
+) -> dict:
+    """fetch_youtube_analytics_range with per-range TTL caching"""
+    today = datetime.date.today().isoformat()
+    cache = _ANALYTICS_HISTORY_CACHE if end_date < today else _ANALYTICS_RECENT_CACHE
+    key = (channel_id, start_date, end_date)
+    payload = cache.get(key)
+    if payload is None:
+        payload = fetch_youtube_analytics_range(
+            channel_id=channel_id,
+            access_token=access_token,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        cache[key] = payload
+    return payload
+
+
 def save_stats_snapshot(user_id: str, stats: dict) -> bool:
     """
     Save a snapshot of channel stats to the database.
@@ -268,7 +312,9 @@ def fetch_youtube_analytics_range(
     }
     headers = {"Authorization": f"Bearer {access_token}"}
 
-    response = requests.get(analytics_url, params=params, headers=headers, timeout=30)
+    response = http_session.get(
+        analytics_url, params=params, headers=headers, timeout=30
+    )
     data = response.json()
 
     if "error" in data:
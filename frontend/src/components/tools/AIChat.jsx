@@ -516,20 +516,30 @@ function AIChat({ hideSidebar = false, projectId = null }) {
             try {
               const data = JSON.parse(jsonStr);
 
-              if (data.type === "thought") {
-                accumulatedThought += data.content;
+              // "batch" frames carry coalesced deltas for both streams;
+              // "thought"/"answer" frames carry a single delta.
+              let thoughtDelta = "";
+              let answerDelta = "";
+              if (data.type === "batch") {
+                thoughtDelta = data.thought || "";
+                answerDelta = data.answer || "";
+              } else if (data.type === "thought") {
+                thoughtDelta = data.content;
               } else {
-                accumulatedContent += data.content;
+                answerDelta = data.content;
               }
 
+              accumulatedThought += thoughtDelta;
+              accumulatedContent += answerDelta;
+
               setMessages((prev) =>
                 prev.map((msg) => {
                   if (msg.id === aiMsgId) {
-                    if (data.type === "thought") {
-                      return { ...msg, thought: msg.thought + data.content };
-                    } else {
-                      return { ...msg, content: msg.content + data.content };
-                    }
+                    return {
+                      ...msg,
+                      thought: msg.thought + thoughtDelta,
+                      content: msg.content + answerDelta,
+                    };
                   }
                   return msg;
                 }),